@@ -1,23 +1,33 @@
+import threading
 from datetime import datetime, timedelta
+import bcrypt
+from cachetools import TTLCache
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded-token cache: the same bearer token arrives on every request from a
+# logged-in client, so skip the repeated HMAC verify + JSON parse. The short
+# TTL keeps the window after real expiry negligible.
+_token_cache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = threading.Lock()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    # Truncate password to 72 bytes (bcrypt limitation)
-    if len(plain_password.encode('utf-8')) > 72:
-        plain_password = plain_password[:72]
-    return pwd_context.verify(plain_password, hashed_password)
+    # bcrypt reads at most 72 *bytes*; truncate the encoded form, since a
+    # 72-character slice of a multibyte password can still exceed that and
+    # newer bcrypt releases raise instead of truncating silently
+    return bcrypt.checkpw(
+        plain_password.encode('utf-8')[:72], hashed_password.encode('utf-8')
+    )
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    # Truncate password to 72 bytes (bcrypt limitation)
-    if len(password.encode('utf-8')) > 72:
-        password = password[:72]
-    return pwd_context.hash(password)
+    # The bcrypt cost dominates login latency, so the work factor stays an
+    # explicit, configurable choice. Google OAuth accounts store no hash at
+    # all and are rejected before any bcrypt work in login.
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    # Same 72-byte truncation as verify_password
+    return bcrypt.hashpw(password.encode('utf-8')[:72], salt).decode('utf-8')
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Create a JWT access token"""
@@ -33,10 +43,18 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 
 def decode_token(token: str) -> dict:
     """Decode and verify a JWT token"""
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    with _token_cache_lock:
+        _token_cache[token] = payload
+    return payload
+
 
@@ -0,0 +1,39 @@
+"""Tiny in-process TTL cache for the per-user note list responses.
+
+GET /notes only changes when the user writes (create/update/delete/share),
+so repeat listings can be served from memory. Entries are invalidated
+explicitly on the write paths and expire after a short TTL as a safety
+net (edits made by another user through a shared note become visible at
+worst one TTL later).
+"""
+import threading
+import time
+
+from config import settings
+
+_store = {}
+_lock = threading.Lock()
+
+def get(kind: str, user_id: int):
+    """Return the cached response for (kind, user_id), or None"""
+    key = (kind, user_id)
+    with _lock:
+        entry = _store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _store[key]
+            return None
+        return value
+
+def set(kind: str, user_id: int, value):
+    """Cache a response for (kind, user_id)"""
+    with _lock:
+        _store[(kind, user_id)] = (time.monotonic() + settings.NOTES_CACHE_TTL, value)
+
+def invalidate(user_id: int):
+    """Drop every cached response belonging to a user"""
+    with _lock:
+        for key in [k for k in _store if k[1] == user_id]:
+            del _store[key]
@@ -5,11 +5,19 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./notes.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
     
     # Security
     SECRET_KEY: str = "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"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours (24 * 60 minutes)
+    BCRYPT_ROUNDS: int = 11  # ~100-150ms per hash; bump if hardware allows
+
+    # Caching
+    NOTES_CACHE_TTL: int = 30  # seconds a cached note listing may live
     
     # Google OAuth
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -1,21 +1,154 @@
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL, #<- opens the database file
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+# The public DATABASE_URL stays in the familiar sync form; rewrite it to the
+# aiosqlite driver here so .env files don't need to change
+_url = settings.DATABASE_URL
+if _url.startswith("sqlite://"):
+    _url = _url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# SQLite treats a missing database name ("sqlite://") the same as an
+# explicit ":memory:" (including URI forms like "file::memory:&cache=shared")
+_db_name = make_url(_url).database or ""
+_is_memory_db = _url.startswith("sqlite") and (
+    _db_name == "" or ":memory:" in _db_name
+)
+
+if _is_memory_db:
+    # A single shared connection so every session sees the same in-memory DB
+    _pool_kwargs = {"poolclass": StaticPool}
+else:
+    # Long-lived pooled connections keep SQLite's page cache hot across
+    # requests instead of paying connection setup per request. Sizes are
+    # settings so deployments can match them to their worker count without
+    # code changes.
+    _pool_kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+
+# orjson handles every JSON column (e.g. Note.tags) in native code, far
+# faster than the stdlib json the engine would use by default
+engine = create_async_engine(
+    _url,
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    # Roomy compiled-SQL cache so every hot statement (including the
+    # module-level bindparam selects in the routers) stays compiled for
+    # the life of the process
+    query_cache_size=1200,
+    **_pool_kwargs,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if _url.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Configure each SQLite connection.
+
+        FK enforcement is off by default in SQLite and must be switched on
+        per connection — note deletion relies on ON DELETE CASCADE to
+        clean up share rows, so this applies to every database, in-memory
+        included. The tuning pragmas (WAL lets readers proceed while a
+        note is being written and halves the fsync traffic per commit; the
+        rest keep temp data and hot pages in memory) only make sense for
+        file-backed databases.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if not _is_memory_db:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-64000")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+# expire_on_commit=False so responses can read attributes after commit
+# without triggering implicit (and under asyncio, illegal) lazy refreshes
+SessionLocal = async_sessionmaker(
+    engine, autocommit=False, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
-def get_db():
+def run_sqlite_migrations(connection):
+    """Bring databases created by earlier versions up to the current schema.
+
+    Base.metadata.create_all skips tables that already exist, so schema
+    additions (like the unique share index the share upsert's ON CONFLICT
+    clause targets) never reach a pre-existing notes.db on their own.
+    Runs on the sync connection inside the startup transaction; every
+    step is idempotent.
+    """
+    if not _url.startswith("sqlite"):
+        return
+
+    # Collapse any duplicate share rows left by the old check-then-insert
+    # flow so the unique index below can be created
+    connection.exec_driver_sql(
+        "DELETE FROM shared_notes WHERE id NOT IN ("
+        " SELECT MIN(id) FROM shared_notes"
+        " GROUP BY note_id, shared_with_user_id)"
+    )
+
+    # delete_note relies on the note_id FK cascading, but SQLite can't
+    # ALTER an FK — rebuild shared_notes when an old database still has
+    # the action-less constraint. PRAGMA foreign_key_list rows are
+    # (id, seq, table, from, to, on_update, on_delete, match).
+    fk_rows = connection.exec_driver_sql(
+        "PRAGMA foreign_key_list('shared_notes')"
+    ).fetchall()
+    needs_cascade = any(
+        row[2] == "notes" and (row[6] or "").upper() != "CASCADE"
+        for row in fk_rows
+    )
+    if needs_cascade:
+        connection.exec_driver_sql(
+            "CREATE TABLE shared_notes_migrated ("
+            " id INTEGER NOT NULL PRIMARY KEY,"
+            " note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,"
+            " shared_by_user_id INTEGER NOT NULL REFERENCES users (id),"
+            " shared_with_user_id INTEGER NOT NULL REFERENCES users (id),"
+            " shared_at DATETIME,"
+            " can_edit BOOLEAN NOT NULL DEFAULT 0)"
+        )
+        # The WHERE drops share rows already orphaned by deletes that ran
+        # without FK enforcement
+        connection.exec_driver_sql(
+            "INSERT INTO shared_notes_migrated"
+            " SELECT id, note_id, shared_by_user_id, shared_with_user_id,"
+            "        shared_at, COALESCE(can_edit, 0)"
+            " FROM shared_notes"
+            " WHERE note_id IN (SELECT id FROM notes)"
+        )
+        # Dropping the old table drops its indexes; they are recreated below
+        connection.exec_driver_sql("DROP TABLE shared_notes")
+        connection.exec_driver_sql(
+            "ALTER TABLE shared_notes_migrated RENAME TO shared_notes"
+        )
+    connection.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_shared_note_user"
+        " ON shared_notes (note_id, shared_with_user_id)"
+    )
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_shared_note_shared_with"
+        " ON shared_notes (shared_with_user_id, note_id)"
+    )
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_notes_user_id ON notes (user_id)"
+    )
+
+async def get_db():
     """Dependency to get database session"""
-    db = SessionLocal()# <- opening a connection
-    try:
-        yield db # <- use the database 
-    finally:
-        db.close()# <- closing the connection
+    async with SessionLocal() as db:
+        yield db
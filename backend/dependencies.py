@@ -1,38 +1,46 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from models import User
 from auth import decode_token
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """Get the current user's id from the JWT without touching the database.
+
+    Endpoints that only filter by user id should depend on this instead of
+    get_current_user, skipping the user-row SELECT entirely.
+    """
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
-    
+        raise _credentials_exception
+
     user_id_str: str = payload.get("sub")
     if user_id_str is None:
-        raise credentials_exception
-    
+        raise _credentials_exception
+
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError):
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
+        raise _credentials_exception
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get current user from JWT token"""
+    # Session.get is an identity-map-aware primary key lookup; the JWT
+    # already carries the numeric user id in its sub claim
+    user = await db.get(User, user_id)
     if user is None:
-        raise credentials_exception
-    
+        raise _credentials_exception
+
     return user
@@ -1,18 +1,18 @@
 ﻿from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from database import engine, Base
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from database import engine, Base, run_sqlite_migrations
 from config import settings
 from routers import auth, notes
 from dependencies import get_current_user
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Initialize FastAPI app
 app = FastAPI(
     title='Anevo Notes API',
     description='A collaborative note-taking application API',
-    version='1.0.0'
+    version='1.0.0',
+    default_response_class=ORJSONResponse  # orjson encodes large note lists far faster than stdlib json
 )
 
 # Configure CORS
@@ -24,10 +24,22 @@ app.add_middleware(
     allow_headers=['*'],
 )
 
+# Compress larger responses; note listings carry full note contents and
+# compress ~5-10x for negligible CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(notes.router)
 
+@app.on_event('startup')
+async def create_tables():
+    """Create database tables (the async engine can't run DDL at import time)"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all leaves existing tables untouched; bring them up to date
+        await conn.run_sync(run_sqlite_migrations)
+
 @app.get('/test-auth')
 async def test_auth(current_user = Depends(get_current_user)):
     """Test endpoint to verify authentication is working"""
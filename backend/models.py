@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, JSON, Text, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -25,23 +25,37 @@ class Note(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    tags = Column(String, default="[]")
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    
+    # Native JSON column; the engine is configured with orjson as the
+    # (de)serializer, so tag lists round-trip through native code
+    tags = Column(JSON, default=list)
+    # Timestamps are stamped by the database during the INSERT/UPDATE
+    # itself, so write paths carry no Python-side datetime construction
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
     owner = relationship("User", back_populates="notes")
-    shared_instances = relationship("SharedNote", back_populates="note", cascade="all, delete-orphan")
+    # passive_deletes: the FK's ON DELETE CASCADE removes share rows in the
+    # database, so the session doesn't load them just to delete them
+    shared_instances = relationship("SharedNote", back_populates="note", cascade="all, delete-orphan", passive_deletes=True)
 
 class SharedNote(Base):
     __tablename__ = "shared_notes"
-    
+    __table_args__ = (
+        # Every share/unshare/permission check filters on this pair; unique
+        # also guarantees a note is shared at most once per user
+        Index("ix_shared_note_user", "note_id", "shared_with_user_id", unique=True),
+        # GET /notes/shared filters on shared_with_user_id alone; leading
+        # with it (and covering note_id) serves that scan from the index
+        Index("ix_shared_note_shared_with", "shared_with_user_id", "note_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
-    note_id = Column(Integer, ForeignKey("notes.id"), nullable=False)
+    note_id = Column(Integer, ForeignKey("notes.id", ondelete="CASCADE"), nullable=False, index=True)
     shared_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     shared_with_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     shared_at = Column(DateTime, default=datetime.utcnow)
-    can_edit = Column(Integer, default=0)
+    can_edit = Column(Boolean, default=False, nullable=False)
     
     note = relationship("Note", back_populates="shared_instances")
     shared_with_user = relationship("User", foreign_keys=[shared_with_user_id], back_populates="shared_with_me")
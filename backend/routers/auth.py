@@ -1,17 +1,55 @@
+import cachecontrol
+import requests
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from google.oauth2 import id_token
-from google.auth.transport import requests
+from google.auth.transport import requests as google_requests
 import schemas
 import models
-from database import get_db
+from database import get_db, SessionLocal
 from auth import verify_password, get_password_hash, create_access_token
 from config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Statements for the per-login lookups, built once at import time; each
+# request binds parameters and reuses the cached compiled SQL
+_CLASH_CHECK = select(models.User.email, models.User.username).where(
+    or_(
+        models.User.email == bindparam("email"),
+        models.User.username == bindparam("username")
+    )
+)
+_USER_BY_IDENTIFIER = select(models.User).where(
+    or_(
+        models.User.email == bindparam("identifier"),
+        models.User.username == bindparam("identifier")
+    )
+)
+_USER_BY_EMAIL = select(models.User).where(
+    models.User.email == bindparam("email")
+)
+
+# One transport reused for every verification so the HTTPS connection to
+# Google's cert endpoint stays pooled instead of a new handshake per login.
+# CacheControl honors the Cache-Control headers on Google's signing certs,
+# so most verifications never leave the process at all
+_google_transport = google_requests.Request(
+    session=cachecontrol.CacheControl(requests.Session())
+)
+
+def verify_google_token(token: str) -> dict:
+    """Verify a Google ID token (blocking; run in the threadpool)"""
+    return id_token.verify_oauth2_token(
+        token,
+        _google_transport,
+        settings.GOOGLE_CLIENT_ID
+    )
+
 @router.post("/register", response_model=schemas.Token)
-async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     try:
         # Validate password length
@@ -21,18 +59,20 @@ async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         if len(user.password) > 72:
             raise HTTPException(status_code=400, detail="Password cannot be longer than 72 characters")
         
-        # Check if user with email already exists
-        db_user = db.query(models.User).filter(models.User.email == user.email).first()
-        if db_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Check if username already exists
-        db_user = db.query(models.User).filter(models.User.username == user.username).first()
-        if db_user:
+        # One query finds a clash on either email or username; branch on
+        # which column matched to keep the distinct error messages
+        existing = (await db.execute(
+            _CLASH_CHECK, {"email": user.email, "username": user.username}
+        )).first()
+        if existing:
+            if existing.email == user.email:
+                raise HTTPException(status_code=400, detail="Email already registered")
             raise HTTPException(status_code=400, detail="Username already taken")
         
-        # Create new user
-        hashed_password = get_password_hash(user.password)
+        # Create new user. Hashing takes ~100ms of pure CPU, so run it in
+        # the threadpool (bcrypt releases the GIL) instead of blocking the
+        # event loop
+        hashed_password = await run_in_threadpool(get_password_hash, user.password)
         new_user = models.User(
             email=user.email,
             username=user.username,
@@ -42,8 +82,8 @@ async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         
         # Create access token
         access_token = create_access_token(data={"sub": str(new_user.id)})
@@ -67,13 +107,12 @@ async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
 @router.post("/login", response_model=schemas.Token)
-async def login(credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: schemas.UserLogin, db: AsyncSession = Depends(get_db)):
     """Login with email/username and password"""
     # Find user by email or username
-    user = db.query(models.User).filter(
-        (models.User.email == credentials.identifier) | 
-        (models.User.username == credentials.identifier)
-    ).first()
+    user = (await db.scalars(
+        _USER_BY_IDENTIFIER, {"identifier": credentials.identifier}
+    )).first()
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -85,8 +124,9 @@ async def login(credentials: schemas.UserLogin, db: Session = Depends(get_db)):
             detail="This account uses Google sign-in. Please use 'Sign in with Google' button."
         )
     
-    # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    # Verify password off the event loop; bcrypt releases the GIL so
+    # verifications run truly in parallel on the threadpool
+    if not await run_in_threadpool(verify_password, credentials.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Create access token
@@ -104,75 +144,81 @@ async def login(credentials: schemas.UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/google", response_model=schemas.Token)
-async def google_auth(req: schemas.GoogleAuthRequest, db: Session = Depends(get_db)):
+async def google_auth(req: schemas.GoogleAuthRequest):
     """Authenticate with Google OAuth"""
     try:
-        # Verify the Google token
-        idinfo = id_token.verify_oauth2_token(
-            req.token,
-            requests.Request(),
-            settings.GOOGLE_CLIENT_ID
-        )
-        
+        # Verify the Google token first, before any session is opened, so
+        # no pooled connection sits idle during the external HTTPS round-trip.
+        # The blocking HTTPS call runs in the threadpool to keep the event
+        # loop free.
+        idinfo = await run_in_threadpool(verify_google_token, req.token)
+
         # Extract user info from Google
         email = idinfo['email']
         name = idinfo.get('name', email.split('@')[0])
         google_id = idinfo['sub']
-        
-        # Check if user exists
-        db_user = db.query(models.User).filter(models.User.email == email).first()
-        
-        if db_user:
-            # User exists - check if it's a Google OAuth user
-            if db_user.auth_provider != "google":
-                raise HTTPException(
-                    status_code=400,
-                    detail="This email is registered with username/password. Please use regular login."
+
+        async with SessionLocal() as db:
+            # Check if user exists
+            db_user = (await db.scalars(_USER_BY_EMAIL, {"email": email})).first()
+
+            if db_user:
+                # User exists - check if it's a Google OAuth user
+                if db_user.auth_provider != "google":
+                    raise HTTPException(
+                        status_code=400,
+                        detail="This email is registered with username/password. Please use regular login."
+                    )
+
+                # Update user info if changed
+                db_user.name = name
+                db_user.google_id = google_id
+                await db.commit()
+                await db.refresh(db_user)
+            else:
+                # Create new Google OAuth user
+                # Generate a unique username from email. One range query
+                # fetches every taken name with this prefix; probing each
+                # candidate with its own SELECT was O(collisions) round-trips
+                base_username = email.split('@')[0]
+                taken = set((await db.scalars(
+                    select(models.User.username).where(
+                        models.User.username.like(f"{base_username}%")
+                    )
+                )).all())
+                username = base_username
+                counter = 1
+                while username in taken:
+                    username = f"{base_username}{counter}"
+                    counter += 1
+
+                db_user = models.User(
+                    email=email,
+                    username=username,
+                    name=name,
+                    google_id=google_id,
+                    auth_provider="google",
+                    hashed_password=None
                 )
-            
-            # Update user info if changed
-            db_user.name = name
-            db_user.google_id = google_id
-            db.commit()
-            db.refresh(db_user)
-        else:
-            # Create new Google OAuth user
-            # Generate a unique username from email
-            base_username = email.split('@')[0]
-            username = base_username
-            counter = 1
-            
-            while db.query(models.User).filter(models.User.username == username).first():
-                username = f"{base_username}{counter}"
-                counter += 1
-            
-            db_user = models.User(
-                email=email,
-                username=username,
-                name=name,
-                google_id=google_id,
-                auth_provider="google",
-                hashed_password=None
-            )
-            
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
-        
-        # Create JWT token
-        access_token = create_access_token(data={"sub": str(db_user.id)})
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": db_user.id,
-                "email": db_user.email,
-                "username": db_user.username,
-                "name": db_user.name
+
+                db.add(db_user)
+                await db.commit()
+                await db.refresh(db_user)
+
+            # Create JWT token
+            access_token = create_access_token(data={"sub": str(db_user.id)})
+
+            return {
+                "access_token": access_token,
+                "token_type": "bearer",
+                "user": {
+                    "id": db_user.id,
+                    "email": db_user.email,
+                    "username": db_user.username,
+                    "name": db_user.name
+                }
             }
-        }
-        
+
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid Google token: {str(e)}")
     except Exception as e:
@@ -1,151 +1,253 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from typing import List
-import json
+import cache
 import schemas
 import models
 from database import get_db
-from dependencies import get_current_user
+from dependencies import get_current_user, get_current_user_id
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
-@router.get("", response_model=List[schemas.NoteResponse])
+# Statements built once at import time; each request only binds parameters
+# and reuses the cached compiled SQL. The two INSERTs (create_note and the
+# share upsert) stay inline since their values vary per request; the
+# engine's query cache still reuses their compiled form.
+_OWNED_NOTES_WITH_SHARES = select(models.Note).options(
+    # Batch-load the share rows and join each one to its target user, so
+    # usernames come back with the shares instead of one lookup per share
+    selectinload(models.Note.shared_instances).joinedload(
+        models.SharedNote.shared_with_user
+    ),
+    # Everything get_notes touches is eager-loaded above; any new
+    # relationship access should fail loudly rather than silently
+    # reintroduce a per-row SELECT
+    raiseload("*")
+).where(models.Note.user_id == bindparam("user_id"))
+
+# Flat share -> note -> owner join for GET /notes/shared; plain rows skip
+# ORM instance construction, and the timestamp is ISO-formatted in SQL
+# (cheaper than datetime parsing plus Python-side isoformat per row)
+_SHARED_NOTES = select(
+    models.Note.id,
+    models.Note.title,
+    models.Note.content,
+    models.Note.tags,
+    func.strftime(
+        "%Y-%m-%dT%H:%M:%f",
+        func.coalesce(models.Note.updated_at, models.Note.created_at)
+    ).label("last_edited"),
+    models.User.username,
+    models.SharedNote.can_edit,
+).join(
+    models.Note, models.SharedNote.note_id == models.Note.id
+).join(
+    models.User, models.Note.user_id == models.User.id
+).where(models.SharedNote.shared_with_user_id == bindparam("user_id"))
+
+# UPDATE with the owner-or-editor permission check in its WHERE clause;
+# handlers attach .values(...) per request. The parameter names avoid the
+# column names, which update() reserves for its SET clause
+_UPDATE_NOTE = update(models.Note).where(
+    models.Note.id == bindparam("nid"),
+    or_(
+        models.Note.user_id == bindparam("uid"),
+        models.Note.id.in_(
+            select(models.SharedNote.note_id).where(
+                models.SharedNote.shared_with_user_id == bindparam("uid"),
+                models.SharedNote.can_edit.is_(True)
+            )
+        )
+    )
+)
+
+_DELETE_OWNED_NOTE = delete(models.Note).where(
+    models.Note.id == bindparam("note_id"),
+    models.Note.user_id == bindparam("user_id")
+)
+
+# Ownership EXISTS plus username -> id scalar subquery in one statement,
+# keeping the endpoints' distinct error messages on a single round-trip
+_OWNER_AND_TARGET = select(
+    select(models.Note.id).where(
+        models.Note.id == bindparam("note_id"),
+        models.Note.user_id == bindparam("user_id")
+    ).exists().label("owns_note"),
+    select(models.User.id).where(
+        models.User.username == bindparam("username")
+    ).scalar_subquery().label("target_user_id"),
+)
+
+_OWNS_NOTE = select(models.Note.id).where(
+    models.Note.id == bindparam("note_id"),
+    models.Note.user_id == bindparam("user_id")
+)
+
+_NOTE_SHARES = select(models.User.username, models.SharedNote.can_edit).join(
+    models.User, models.User.id == models.SharedNote.shared_with_user_id
+).where(models.SharedNote.note_id == bindparam("note_id"))
+
+# One DELETE for unshare: username resolves through a scalar subquery,
+# ownership is an EXISTS, RETURNING hands back the target's id
+_UNSHARE = delete(models.SharedNote).where(
+    models.SharedNote.note_id == bindparam("note_id"),
+    models.SharedNote.shared_with_user_id == select(models.User.id).where(
+        models.User.username == bindparam("username")
+    ).scalar_subquery(),
+    select(models.Note.id).where(
+        models.Note.id == bindparam("note_id"),
+        models.Note.user_id == bindparam("user_id")
+    ).exists()
+).returning(models.SharedNote.shared_with_user_id)
+
+# response_model=None: the handlers build NoteResponse objects themselves
+# (via model_construct), so FastAPI's second validation pass over every
+# field of every note would only burn CPU re-checking known-good data
+# response_class pinned to ORJSONResponse so these serialization-heavy
+# routes keep the fast encoder even if the app default ever changes
+@router.get("", response_model=None, response_class=ORJSONResponse)
 async def get_notes(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all notes owned by the current user"""
+    cached = cache.get("notes", current_user.id)
+    if cached is not None:
+        return cached
+
+    owned = (await db.execute(
+        _OWNED_NOTES_WITH_SHARES, {"user_id": current_user.id}
+    )).scalars().all()
+
+    # model_construct skips Pydantic validation; every field here comes
+    # straight from the ORM, so there is nothing left to validate
     notes = []
-    for note in current_user.notes:
-        try:
-            tags = json.loads(note.tags) if note.tags else []
-        except:
-            tags = []
-        
-        # Get list of users this note is shared with
-        shared_with = []
-        for shared in note.shared_instances:
-            shared_user = db.query(models.User).filter(models.User.id == shared.shared_with_user_id).first()
-            if shared_user:
-                shared_with.append(shared_user.username)
-        
-        notes.append(schemas.NoteResponse(
+    for note in owned:
+        notes.append(schemas.NoteResponse.model_construct(
             id=note.id,
             title=note.title,
             content=note.content,
-            tags=tags,
-            lastEdited=note.updated_at.isoformat() if note.updated_at else note.created_at.isoformat(),
+            tags=note.tags,
+            lastEdited=(note.updated_at or note.created_at).isoformat(),
             owner=current_user.username,
             isShared=False,
             canEdit=True,
-            sharedWith=shared_with
+            sharedWith=[s.shared_with_user.username for s in note.shared_instances]
         ))
-    
+
+    cache.set("notes", current_user.id, notes)
     return notes
 
-@router.get("/shared", response_model=List[schemas.NoteResponse])
+@router.get("/shared", response_model=None, response_class=ORJSONResponse)
 async def get_shared_notes(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all notes shared with the current user"""
-    notes = []
-    for shared in current_user.shared_with_me:
-        note = shared.note
-        try:
-            tags = json.loads(note.tags) if note.tags else []
-        except:
-            tags = []
-        
-        notes.append(schemas.NoteResponse(
-            id=note.id,
-            title=note.title,
-            content=note.content,
-            tags=tags,
-            lastEdited=note.updated_at.isoformat() if note.updated_at else note.created_at.isoformat(),
-            owner=note.owner.username,
+    cached = cache.get("shared", current_user_id)
+    if cached is not None:
+        return cached
+
+    rows = (await db.execute(_SHARED_NOTES, {"user_id": current_user_id})).all()
+
+    notes = [
+        schemas.NoteResponse.model_construct(
+            id=row.id,
+            title=row.title,
+            content=row.content,
+            tags=row.tags,
+            lastEdited=row.last_edited,
+            owner=row.username,
             isShared=True,
-            canEdit=bool(shared.can_edit)
-        ))
-    
+            canEdit=row.can_edit,
+            sharedWith=[]
+        )
+        for row in rows
+    ]
+
+    cache.set("shared", current_user_id, notes)
     return notes
 
 @router.post("", response_model=schemas.MessageResponse)
 async def create_note(
     note: schemas.NoteCreate,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new note"""
-    new_note = models.Note(
-        title=note.title,
-        content=note.content,
-        tags=json.dumps(note.tags),
-        user_id=current_user.id
-    )
-    db.add(new_note)
-    db.commit()
-    db.refresh(new_note)
-    
-    return {"message": f"Note created with ID: {new_note.id}"}
+    # RETURNING hands back the generated id with the INSERT itself, so no
+    # refresh SELECT is needed after the commit
+    new_id = (await db.execute(
+        insert(models.Note).values(
+            title=note.title,
+            content=note.content,
+            tags=note.tags,
+            user_id=current_user_id
+        ).returning(models.Note.id)
+    )).scalar_one()
+    await db.commit()
+    cache.invalidate(current_user_id)
+
+    return {"message": f"Note created with ID: {new_id}"}
 
 @router.put("/{note_id}", response_model=schemas.MessageResponse)
 async def update_note(
     note_id: int,
     note: schemas.NoteUpdate,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a note"""
-    # Check if user owns the note
-    db_note = db.query(models.Note).filter(
-        models.Note.id == note_id,
-        models.Note.user_id == current_user.id
-    ).first()
-    
-    # If not owner, check if they have edit permission on shared note
-    if not db_note:
-        shared = db.query(models.SharedNote).filter(
-            models.SharedNote.note_id == note_id,
-            models.SharedNote.shared_with_user_id == current_user.id,
-            models.SharedNote.can_edit == 1
-        ).first()
-        
-        if not shared:
-            raise HTTPException(status_code=403, detail="You don't have permission to edit this note")
-        
-        db_note = shared.note
-    
-    if note.title is not None:
-        db_note.title = note.title
-    if note.content is not None:
-        db_note.content = note.content
-    if note.tags is not None:
-        db_note.tags = json.dumps(note.tags)
-    
-    from datetime import datetime
-    db_note.updated_at = datetime.utcnow()
-    db.commit()
+    values = {
+        field: value
+        for field, value in (
+            ("title", note.title),
+            ("content", note.content),
+            ("tags", note.tags),
+        )
+        if value is not None
+    }
+
+    # One UPDATE carries the owner-or-editor permission check in its WHERE
+    # clause; no SELECT, no ORM row, no dirty tracking. updated_at is
+    # stamped by the column's onupdate, and an empty payload still bumps
+    # it, matching the old behavior
+    stmt = _UPDATE_NOTE.values(**values) if values else _UPDATE_NOTE.values(updated_at=func.now())
+    result = await db.execute(
+        stmt, {"nid": note_id, "uid": current_user_id}
+    )
+
+    if result.rowcount == 0:
+        raise HTTPException(status_code=403, detail="You don't have permission to edit this note")
+
+    await db.commit()
+    cache.invalidate(current_user_id)
     
     return {"message": "Note updated successfully"}
 
 @router.delete("/{note_id}", response_model=schemas.MessageResponse)
 async def delete_note(
     note_id: int,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a note (only owner can delete)"""
-    db_note = db.query(models.Note).filter(
-        models.Note.id == note_id,
-        models.Note.user_id == current_user.id
-    ).first()
-    
-    if not db_note:
+    # One DELETE with the ownership filter built in; rowcount tells us
+    # whether anything matched, so no prior SELECT or ORM object is needed.
+    # Share rows go with the note via the FK's ON DELETE CASCADE.
+    result = await db.execute(
+        _DELETE_OWNED_NOTE, {"note_id": note_id, "user_id": current_user_id}
+    )
+
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Note not found or you don't own it")
-    
-    db.delete(db_note)
-    db.commit()
+
+    await db.commit()
+    cache.invalidate(current_user_id)
     
     return {"message": "Note deleted successfully"}
 
@@ -153,88 +255,97 @@ async def delete_note(
 async def share_note(
     note_id: int,
     share_req: schemas.ShareNoteRequest,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Share a note with another user"""
-    # Check if user owns the note
-    note = db.query(models.Note).filter(
-        models.Note.id == note_id,
-        models.Note.user_id == current_user.id
-    ).first()
-    
-    if not note:
+    # One round-trip validates ownership and resolves the target user,
+    # preserving the distinct error messages
+    checks = (await db.execute(
+        _OWNER_AND_TARGET,
+        {"note_id": note_id, "user_id": current_user_id, "username": share_req.username}
+    )).one()
+
+    if not checks.owns_note:
         raise HTTPException(status_code=404, detail="Note not found or you don't own it")
-    
-    # Find the user to share with by username
-    share_with_user = db.query(models.User).filter(
-        models.User.username == share_req.username
-    ).first()
-    
-    if not share_with_user:
+
+    if checks.target_user_id is None:
         raise HTTPException(status_code=404, detail=f"User '{share_req.username}' not found in the system")
-    
+
     # Check if user is trying to share with themselves
-    if share_with_user.id == current_user.id:
+    if checks.target_user_id == current_user_id:
         raise HTTPException(status_code=400, detail="You cannot share a note with yourself")
     
-    # Check if already shared
-    existing_share = db.query(models.SharedNote).filter(
-        models.SharedNote.note_id == note_id,
-        models.SharedNote.shared_with_user_id == share_with_user.id
-    ).first()
-    
-    if existing_share:
-        # Update permissions
-        existing_share.can_edit = 1 if share_req.can_edit else 0
-        db.commit()
-        return {"message": "Share permissions updated", "shared_with": share_req.username}
-    
-    # Create new share
-    shared_note = models.SharedNote(
+    # Insert the share, or update permissions if one already exists; the
+    # unique (note_id, shared_with_user_id) index makes this a single
+    # atomic statement with no SELECT-then-branch race
+    stmt = sqlite_insert(models.SharedNote).values(
         note_id=note_id,
-        shared_by_user_id=current_user.id,
-        shared_with_user_id=share_with_user.id,
-        can_edit=1 if share_req.can_edit else 0
+        shared_by_user_id=current_user_id,
+        shared_with_user_id=checks.target_user_id,
+        can_edit=share_req.can_edit
+    ).on_conflict_do_update(
+        index_elements=["note_id", "shared_with_user_id"],
+        set_={"can_edit": share_req.can_edit}
     )
-    db.add(shared_note)
-    db.commit()
-    
+    await db.execute(stmt)
+    await db.commit()
+    cache.invalidate(current_user_id)
+    # The target's shared list just changed too
+    cache.invalidate(checks.target_user_id)
+
     return {"message": "Note shared successfully", "shared_with": share_req.username}
 
+@router.get("/{note_id}/shares", response_model=List[schemas.SharedNoteInfo])
+async def get_note_shares(
+    note_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get list of users a note is shared with (owner only)"""
+    # id-only ownership probe; pulling the full row would drag the whole
+    # content blob across just to throw it away
+    owns = (await db.execute(
+        _OWNS_NOTE, {"note_id": note_id, "user_id": current_user_id}
+    )).scalar_one_or_none()
+
+    if owns is None:
+        raise HTTPException(status_code=404, detail="Note not found or you don't own it")
+
+    # Only two columns leave the database; the from_attributes response
+    # model reads them straight off the row tuples, with no SharedNote or
+    # User objects hydrated in between
+    return (await db.execute(_NOTE_SHARES, {"note_id": note_id})).all()
+
 @router.delete("/{note_id}/share/{username}", response_model=schemas.MessageResponse)
 async def unshare_note(
     note_id: int,
     username: str,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Remove sharing access from a user"""
-    # Check if user owns the note
-    note = db.query(models.Note).filter(
-        models.Note.id == note_id,
-        models.Note.user_id == current_user.id
-    ).first()
-    
-    if not note:
-        raise HTTPException(status_code=404, detail="Note not found or you don't own it")
-    
-    # Find the shared user
-    shared_user = db.query(models.User).filter(models.User.username == username).first()
-    if not shared_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Delete the share
-    shared = db.query(models.SharedNote).filter(
-        models.SharedNote.note_id == note_id,
-        models.SharedNote.shared_with_user_id == shared_user.id
-    ).first()
-    
-    if not shared:
+    deleted = (await db.execute(
+        _UNSHARE,
+        {"note_id": note_id, "user_id": current_user_id, "username": username}
+    )).first()
+
+    if deleted is None:
+        # Nothing matched; run the checks individually only on this cold
+        # path so each failure keeps its distinct 404 message
+        checks = (await db.execute(
+            _OWNER_AND_TARGET,
+            {"note_id": note_id, "user_id": current_user_id, "username": username}
+        )).one()
+        if not checks.owns_note:
+            raise HTTPException(status_code=404, detail="Note not found or you don't own it")
+        if checks.target_user_id is None:
+            raise HTTPException(status_code=404, detail="User not found")
         raise HTTPException(status_code=404, detail="This note is not shared with that user")
-    
-    db.delete(shared)
-    db.commit()
-    
+
+    await db.commit()
+    cache.invalidate(current_user_id)
+    cache.invalidate(deleted.shared_with_user_id)
+
     return {"message": "Note unshared successfully"}
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime
 from typing import Optional, List
 
@@ -17,15 +17,14 @@ class UserLogin(BaseModel):
 
 class User(UserBase):
     id: int
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 # Token Schemas
 class Token(BaseModel):
     access_token: str
     token_type: str
-    user: dict  # Changed to dict to match main_old.py
+    user: dict
 
 # Note Schemas
 class NoteBase(BaseModel):
@@ -42,6 +41,8 @@ class NoteUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 class NoteResponse(BaseModel):
+    # The list endpoints build these with model_construct from trusted ORM
+    # rows and skip validation; keep the field set in sync with the routers
     id: int
     title: str
     content: str
@@ -53,8 +54,14 @@ class NoteResponse(BaseModel):
     sharedWith: Optional[List[str]] = []  # List of usernames this note is shared with
 
 # Share Schemas
+class SharedNoteInfo(BaseModel):
+    username: str
+    can_edit: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
 class ShareNoteRequest(BaseModel):
-    username: str  # Changed from email to username to match main_old.py
+    username: str
     can_edit: bool = False
 
 class ShareNoteResponse(BaseModel):